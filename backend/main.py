@@ -17,39 +17,123 @@ load_dotenv("/root/assistant-brain-os/.env")
 os.environ["DATABASE_PATH"] = "/root/assistant-brain-os/data/brain.db"
 os.environ["CHROMA_PATH"] = "/root/assistant-brain-os/data/chroma"
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import jwt
-import redis
-import json
+import redis.asyncio as aioredis
+import orjson
 import uuid
-import subprocess
-import glob as globmod
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 import asyncio
 import pathlib
+import time
+import hashlib
+import heapq
+import hmac
+import threading
+import itertools
+import functools
+import importlib
+import tempfile
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# common.database lives outside this repo and makes no thread-safety promise
+# (a default sqlite3 connection refuses use from any thread but its creator).
+# So every db call runs on one dedicated thread, and the module is imported on
+# that same thread, so anything it opens at import time belongs to it too.
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+db = DB_EXECUTOR.submit(lambda: importlib.import_module("common.database").db).result()
 
 from common.routing import route_deterministic, is_casual, get_casual_response
+from common.contracts import Job, KnowledgeEntry
+from common.config import TASK_QUEUE, LLM_PROVIDER, MODEL_NAME
+from common.knowledge_graph import KnowledgeGraph
+
+async def _run_db(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(DB_EXECUTOR, fn, *args)
+
+def _on_db_thread(fn):
+    """Turn a sync handler into an async one that runs on DB_EXECUTOR.
+
+    functools.wraps keeps the signature visible to FastAPI for parameter and
+    dependency resolution.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await _run_db(functools.partial(fn, *args, **kwargs))
+    return wrapper
 
 # Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-this-in-production-please")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+ACCESS_TOKEN_EXPIRE = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
 # Redis connection (same as bot)
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-redis_client = redis.from_url(REDIS_URL)
+# Replies are decoded to str by the client, since every value we store is
+# UTF-8 JSON and keys are plain ASCII. Both pools are blocking: when every
+# connection is busy, callers wait up to REDIS_POOL_TIMEOUT for one instead
+# of failing at once with "Too many connections".
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+REDIS_POOL_TIMEOUT = 5  # seconds
+redis_pool = aioredis.BlockingConnectionPool.from_url(
+    REDIS_URL, max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT,
+    decode_responses=True
+)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+# BLPOP readers (SSE streams, long-polls) hold their connection for the whole
+# wait, so they get their own pool; a crowd of open chat tabs can't starve the
+# other endpoints of connections.
+REDIS_STREAM_CONNECTIONS = int(os.getenv("REDIS_STREAM_CONNECTIONS", "256"))
+redis_stream_pool = aioredis.BlockingConnectionPool.from_url(
+    REDIS_URL, max_connections=REDIS_STREAM_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT,
+    decode_responses=True
+)
+redis_stream_client = aioredis.Redis(connection_pool=redis_stream_pool)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Names below are defined further down; they're resolved at startup.
+    app.state.pm2_refresher = asyncio.create_task(_pm2_refresher())
+    try:
+        yield
+    finally:
+        app.state.pm2_refresher.cancel()
+        await redis_client.aclose()
+        await redis_pool.aclose()
+        await redis_stream_client.aclose()
+        await redis_stream_pool.aclose()
+        HASH_POOL.shutdown(wait=False, cancel_futures=True)
+        DB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
 
 # FastAPI app
-app = FastAPI(title="Brain Bot API", version="2.0.0")
+app = FastAPI(
+    title="Brain Bot API", version="2.0.0", default_response_class=ORJSONResponse, lifespan=lifespan
+)
 
 # CORS
-cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173,http://77.42.93.224").split(",")
+# Explicit origins only: a "*" entry would break credentialed requests, so it
+# is dropped. Entries are stripped so "a, b" in .env still matches the Origin
+# header exactly.
+cors_origins = [
+    o.strip()
+    for o in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173,http://77.42.93.224").split(",")
+    if o.strip()
+]
+if "*" in cors_origins:
+    print("Warning: ignoring '*' in CORS_ORIGINS; list explicit origins instead")
+    cors_origins = [o for o in cors_origins if o != "*"]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -58,6 +142,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies. The pinned Starlette doesn't skip
+# text/event-stream on its own; /messages/stream opts out via Content-Encoding.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 security = HTTPBearer()
 
 # --- Models ---
@@ -95,43 +183,136 @@ USERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "users.jso
 DEFAULT_USERS = {
     "admin": {
         "username": "admin",
-        "hashed_password": "$2b$12$74k.t8dt.vK0ZDR.9pz6QuPiwTKkDRfqhkAQUOmAKzuCJCpE8QhNy",
+        "hashed_password": os.getenv(
+            "ADMIN_PASSWORD_HASH",
+            "$2b$12$74k.t8dt.vK0ZDR.9pz6QuPiwTKkDRfqhkAQUOmAKzuCJCpE8QhNy"
+        ),
         "user_id": "web_user_1"
     }
 }
 
+def _write_atomic(path: str, content: bytes):
+    """Write via a temp file in the same directory + rename, so a crash never leaves a torn file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 def _load_users() -> dict:
     if os.path.exists(USERS_FILE):
         try:
-            with open(USERS_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(USERS_FILE, "rb") as f:
+                return orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError):
             pass
     return DEFAULT_USERS.copy()
 
 def _save_users(users: dict):
-    with open(USERS_FILE, "w") as f:
-        json.dump(users, f, indent=2)
+    _write_atomic(USERS_FILE, orjson.dumps(users, option=orjson.OPT_INDENT_2))
 
 USERS_DB = _load_users()
 
 # --- Auth helpers ---
 
+# Dedicated pool for password hashing so slow hashes never queue behind (or starve)
+# the default executor. bcrypt and argon2 release the GIL, so threads are enough.
+# Beyond HASH_BACKLOG queued + running hashes, requests are refused with 503
+# instead of piling up behind a credential-stuffing burst.
+HASH_WORKERS = os.cpu_count() or 2
+HASH_BACKLOG = 4 * HASH_WORKERS
+HASH_POOL = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="hash")
+_hash_inflight = 0
+
+# New hashes are argon2id; bcrypt hashes from before the switch still verify
+# and are upgraded on the next successful login.
+_PH = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
 def verify_password(plain_password, hashed_password):
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _PH.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+def hash_password(plain_password):
+    return _PH.hash(plain_password)
+
+def password_needs_rehash(hashed_password):
+    return not hashed_password.startswith("$argon2") or _PH.check_needs_rehash(hashed_password)
+
+async def _run_hash(fn, *args):
+    global _hash_inflight
+    if _hash_inflight >= HASH_BACKLOG:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication busy, please retry"
+        )
+    _hash_inflight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(HASH_POOL, fn, *args)
+    finally:
+        _hash_inflight -= 1
+
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + ACCESS_TOKEN_EXPIRE
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class _OrjsonPyJWT(jwt.PyJWT):
+    """PyJWT with the payload parsed by orjson instead of stdlib json."""
+
+    def _decode_payload(self, decoded):
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+# Tokens carry only sub + exp; aud/iss are never issued, so don't check them.
+# Options and the algorithm list are fixed on the instance once instead of
+# being passed (and re-merged) on every decode.
+_jwt = _OrjsonPyJWT(options={"verify_aud": False, "verify_iss": False, "require": ["exp", "sub"]})
+_JWT_ALGORITHMS = [ALGORITHM]
+
+# Decoded-token cache: blake2b(token) -> (username, exp). Tokens are
+# re-presented on every request for their whole 24h lifetime, so skip the
+# HMAC + JSON work on repeats. Keys are digests so raw tokens aren't retained.
+# verify_token is a sync dependency, so FastAPI runs it on threadpool threads;
+# the lock keeps the check-evict-insert sequence consistent across them.
+TOKEN_CACHE_SIZE = 4096
+_token_cache: dict = {}
+_token_cache_lock = threading.Lock()
+
+def _decode_token(token: str) -> Optional[str]:
+    """Return the token's subject, raising jwt.PyJWTError if it doesn't verify."""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached and cached[1] > time.time():
+        return cached[0]
+    payload = _jwt.decode(token, SECRET_KEY, algorithms=_JWT_ALGORITHMS)
+    username = payload.get("sub")
+    if username:
+        with _token_cache_lock:
+            if len(_token_cache) >= TOKEN_CACHE_SIZE:
+                _token_cache.pop(next(iter(_token_cache)))
+            _token_cache[key] = (username, payload["exp"])
+    return username
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
+        username = _decode_token(credentials.credentials)
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         return username
@@ -140,8 +321,82 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+# Wrong-password throttle: username -> (failure count, window start). The
+# endpoint is unauthenticated, so both maps are hard-capped. Failures for
+# usernames that don't exist cost an attacker no hash, so they live in their
+# own map: spraying junk names can only evict other junk, never a real
+# user's lockout. Windows are inserted in start order, so expired ones are
+# pruned from the front before anything live is evicted.
+LOGIN_MAX_FAILURES = 5
+LOGIN_LOCKOUT_SECONDS = 300
+LOGIN_THROTTLE_SIZE = 1024
+_failed_logins: OrderedDict = OrderedDict()
+_failed_unknown_logins: OrderedDict = OrderedDict()
+
+def _login_locked(username: str) -> bool:
+    for failures in (_failed_logins, _failed_unknown_logins):
+        entry = failures.get(username)
+        if not entry:
+            continue
+        count, started = entry
+        if time.monotonic() - started > LOGIN_LOCKOUT_SECONDS:
+            del failures[username]
+            continue
+        return count >= LOGIN_MAX_FAILURES
+    return False
+
+def _record_login_failure(username: str, known: bool = True):
+    failures = _failed_logins if known else _failed_unknown_logins
+    now = time.monotonic()
+    entry = failures.get(username)
+    if entry is None:
+        while failures and now - next(iter(failures.values()))[1] > LOGIN_LOCKOUT_SECONDS:
+            failures.popitem(last=False)
+        if len(failures) >= LOGIN_THROTTLE_SIZE:
+            failures.popitem(last=False)
+        entry = (0, now)
+    count, started = entry
+    failures[username] = (count + 1, started)
+
+# Recently verified logins skip the slow hash for a minute. Keys are an HMAC
+# under a per-process secret over (username, password, stored hash), so a
+# password change invalidates them and nothing reversible is kept in memory.
+# Only successes are cached; failures still pay the full hash and count
+# towards the lockout above.
+LOGIN_CACHE_TTL = 60  # seconds
+LOGIN_CACHE_SIZE = 1024
+_LOGIN_CACHE_SECRET = os.urandom(32)
+_login_cache: dict = {}
+
+def _login_cache_key(username: str, password: str, hashed_password: str) -> bytes:
+    msg = b"\0".join((username.encode(), password.encode(), hashed_password.encode()))
+    return hmac.new(_LOGIN_CACHE_SECRET, msg, hashlib.sha256).digest()
+
+def _login_cached(key: bytes) -> bool:
+    entry = _login_cache.get(key)
+    if entry is None:
+        return False
+    if entry[0] <= time.monotonic():
+        _login_cache.pop(key, None)
+        return False
+    return True
+
+def _remember_login(key: bytes, username: str):
+    if len(_login_cache) >= LOGIN_CACHE_SIZE:
+        _login_cache.pop(next(iter(_login_cache)), None)
+    _login_cache[key] = (time.monotonic() + LOGIN_CACHE_TTL, username)
+
+def _forget_logins(username: str):
+    for key, (_, name) in list(_login_cache.items()):
+        if name == username:
+            del _login_cache[key]
+
+def _find_user(username: str) -> Optional[dict]:
+    """Single lookup point for user records, so a database backend can replace USERS_DB here."""
+    return USERS_DB.get(username)
+
 def _get_user(username: str) -> dict:
-    user = USERS_DB.get(username)
+    user = _find_user(username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -154,12 +409,39 @@ async def root():
 
 @app.post("/auth/login")
 async def login(login_data: LoginRequest):
-    user = USERS_DB.get(login_data.username)
-    if not user or not verify_password(login_data.password, user["hashed_password"]):
+    if _login_locked(login_data.username):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, try again later"
+        )
+    user = _find_user(login_data.username)
+    # Password hashing is deliberately slow; keep it off the event loop
+    ok = cached = False
+    if user:
+        cache_key = _login_cache_key(login_data.username, login_data.password, user["hashed_password"])
+        cached = _login_cached(cache_key)
+        ok = cached or await _run_hash(
+            verify_password, login_data.password, user["hashed_password"]
+        )
+    if not ok:
+        _record_login_failure(login_data.username, known=user is not None)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
+    _failed_logins.pop(login_data.username, None)
+    if password_needs_rehash(user["hashed_password"]):
+        try:
+            user["hashed_password"] = await _run_hash(hash_password, login_data.password)
+            await asyncio.to_thread(_save_users, USERS_DB)
+        except HTTPException:
+            pass  # hash pool saturated; upgrade on a later login
+    # Only a real verification (re)starts the TTL; cache hits don't extend it
+    if not cached:
+        _remember_login(
+            _login_cache_key(login_data.username, login_data.password, user["hashed_password"]),
+            login_data.username
+        )
     access_token = create_access_token(data={"sub": user["username"]})
     return {
         "access_token": access_token,
@@ -173,23 +455,30 @@ async def change_password(
     username: str = Depends(verify_token)
 ):
     user = _get_user(username)
-    if not verify_password(password_req.current_password, user["hashed_password"]):
+    if not await _run_hash(verify_password, password_req.current_password, user["hashed_password"]):
         raise HTTPException(status_code=401, detail="Current password is incorrect")
-    new_hash = bcrypt.hashpw(password_req.new_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-    USERS_DB[username]["hashed_password"] = new_hash
-    _save_users(USERS_DB)
+    new_hash = await _run_hash(hash_password, password_req.new_password)
+    user["hashed_password"] = new_hash
+    _forget_logins(username)
+    await asyncio.to_thread(_save_users, USERS_DB)
     return {"message": "Password changed successfully"}
 
 # --- Chat / Messages ---
 
+# Conversation lists are trimmed server-side on every write. TTLs are
+# deliberately sliding: each write refreshes them, so a conversation expires a
+# day after its last message rather than a day after its first. The EXPIREs
+# ride in the same pipeline as the LPUSH, so they cost no extra round-trip.
+CONVERSATION_MAX_MESSAGES = 500
+CONVERSATION_TTL = 86400
+RESPONSE_TTL = 3600
+
 @app.post("/messages/send", response_model=MessageResponse)
 async def send_message(
     message_req: MessageRequest,
     username: str = Depends(verify_token)
 ):
     user = _get_user(username)
-    from common.contracts import Job
-    from common.config import TASK_QUEUE
 
     conv_key = f"web_conversation:{user['user_id']}"
     now = datetime.now().isoformat()
@@ -202,8 +491,9 @@ async def send_message(
         "sender": "user",
         "timestamp": now
     }
-    redis_client.lpush(conv_key, json.dumps(message_data))
-    redis_client.expire(conv_key, 86400)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.lpush(conv_key, orjson.dumps(message_data))
+    pipe.expire(conv_key, CONVERSATION_TTL)
 
     # Check for casual messages - respond instantly without queuing a job
     if (not message_req.agent or message_req.agent == "auto") and is_casual(message_req.message):
@@ -213,14 +503,24 @@ async def send_message(
             "message": casual_response,
             "sender": "bot",
             "agent": "casual",
+            # Own timestamp, so it sorts after the user message it answers
             "timestamp": datetime.now().isoformat()
         }
         response_key = f"web_response:{user['user_id']}"
-        redis_client.lpush(response_key, json.dumps(response_data))
-        redis_client.expire(response_key, 3600)
-        redis_client.lpush(conv_key, json.dumps(response_data))
-        redis_client.expire(conv_key, 86400)
-        return MessageResponse(**message_data)
+        response_json = orjson.dumps(response_data)
+        pipe.lpush(response_key, response_json)
+        pipe.expire(response_key, RESPONSE_TTL)
+        pipe.lpush(conv_key, response_json)
+        pipe.expire(conv_key, CONVERSATION_TTL)
+        pipe.ltrim(conv_key, 0, CONVERSATION_MAX_MESSAGES - 1)
+        await pipe.execute()
+        return MessageResponse.model_construct(**message_data)
+
+    pipe.ltrim(conv_key, 0, CONVERSATION_MAX_MESSAGES - 1)
+    # Read back recent context (including the message just pushed) in the
+    # same round-trip as the writes
+    pipe.lrange(conv_key, 0, 5)
+    *_, recent_msgs = await pipe.execute()
 
     # Route to agent
     if message_req.agent and message_req.agent != "auto":
@@ -229,11 +529,10 @@ async def send_message(
         agent = route_deterministic(message_req.message)
 
     # Attach recent conversation context for agents that use LLM
-    recent_msgs = redis_client.lrange(conv_key, 0, 5)
     conversation_history = []
     for msg_json in recent_msgs:
         try:
-            conversation_history.append(json.loads(msg_json))
+            conversation_history.append(orjson.loads(msg_json))
         except Exception:
             pass
 
@@ -246,43 +545,83 @@ async def send_message(
             "conversation_history": list(reversed(conversation_history[-6:]))
         }
     )
-    redis_client.lpush(TASK_QUEUE, job.model_dump_json())
+    await redis_client.lpush(TASK_QUEUE, job.model_dump_json())
+
+    return MessageResponse.model_construct(**message_data)
 
-    return MessageResponse(**message_data)
+HISTORY_MAX_LIMIT = 200
 
-@app.get("/messages/history", response_model=List[MessageResponse])
+@app.get("/messages/history")
 async def get_message_history(
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=HISTORY_MAX_LIMIT),
+    username: str = Depends(verify_token)
+):
+    user = _get_user(username)
+    conv_key = f"web_conversation:{user['user_id']}"
+    messages_raw = await redis_client.lrange(conv_key, 0, limit - 1)
+    # Stored dicts go straight to ORJSONResponse; no response_model round-trip
+    return [orjson.loads(msg_json) for msg_json in reversed(messages_raw)]
+
+@app.get("/messages/history/raw")
+async def get_message_history_raw(
+    limit: int = Query(50, ge=1, le=HISTORY_MAX_LIMIT),
     username: str = Depends(verify_token)
 ):
+    """Same messages as /messages/history, spliced straight from the stored JSON blobs without parsing them."""
     user = _get_user(username)
     conv_key = f"web_conversation:{user['user_id']}"
-    messages_raw = redis_client.lrange(conv_key, 0, limit - 1)
-    messages = []
-    for msg_json in messages_raw:
-        msg_data = json.loads(msg_json)
-        messages.append(MessageResponse(**msg_data))
-    return list(reversed(messages))
+    messages_raw = await redis_client.lrange(conv_key, 0, limit - 1)
+    body = "[" + ",".join(reversed(messages_raw)) + "]"
+    return Response(content=body, media_type="application/json")
+
+PENDING_WAIT_TIMEOUT = 25  # seconds, stays under typical proxy read timeouts
+
+async def _drain_responses(response_key: str) -> list:
+    # Drain the whole list atomically in one round-trip; LRANGE keeps the
+    # same head-first order the previous LPOP loop returned.
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.lrange(response_key, 0, -1)
+    pipe.delete(response_key)
+    raw, _ = await pipe.execute()
+    return [orjson.loads(r) for r in raw]
 
 @app.get("/messages/pending")
 async def check_pending_messages(username: str = Depends(verify_token)):
     user = _get_user(username)
     response_key = f"web_response:{user['user_id']}"
-    responses = []
-    while True:
-        response_data = redis_client.lpop(response_key)
-        if not response_data:
-            break
-        responses.append(json.loads(response_data))
-    return {"responses": responses}
+    return {"responses": await _drain_responses(response_key)}
+
+@app.get("/messages/pending/wait")
+async def wait_pending_messages(request: Request, username: str = Depends(verify_token)):
+    """Long-poll variant of /messages/pending: blocks until a response arrives or the timeout passes."""
+    user = _get_user(username)
+    response_key = f"web_response:{user['user_id']}"
+    # Held for the whole wait, so it comes from the blocking-reader pool
+    try:
+        popped = await redis_stream_client.blpop(response_key, timeout=PENDING_WAIT_TIMEOUT)
+    except aioredis.ConnectionError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open chat connections, please retry"
+        )
+    if not popped:
+        return {"responses": []}
+    _, first = popped
+    # The wait isn't cancelled when the client goes away; hand the reply back
+    # to the head of the list so the next poll or stream still gets it.
+    if await request.is_disconnected():
+        await redis_client.lpush(response_key, first)
+        return {"responses": []}
+    return {"responses": [orjson.loads(first)] + await _drain_responses(response_key)}
+
+SSE_HEARTBEAT_SECONDS = 15
 
 @app.get("/messages/stream")
 async def message_stream(token: str = ""):
     """SSE endpoint for real-time message delivery."""
     # Validate token from query param (EventSource can't set headers)
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
+        username = _decode_token(token)
         if not username:
             raise HTTPException(status_code=401, detail="Invalid token")
     except jwt.PyJWTError:
@@ -292,14 +631,15 @@ async def message_stream(token: str = ""):
     response_key = f"web_response:{user['user_id']}"
 
     async def event_generator():
+        # BLPOP wakes as soon as the bot pushes a response; the timeout doubles
+        # as the heartbeat interval on an idle stream.
         while True:
             try:
-                msg = redis_client.lpop(response_key)
-                if msg:
-                    yield f"data: {msg.decode()}\n\n"
+                popped = await redis_stream_client.blpop(response_key, timeout=SSE_HEARTBEAT_SECONDS)
+                if popped:
+                    yield f"data: {popped[1]}\n\n"
                 else:
                     yield ": heartbeat\n\n"
-                await asyncio.sleep(0.3)
             except Exception:
                 break
 
@@ -310,29 +650,50 @@ async def message_stream(token: str = ""):
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "X-Accel-Buffering": "no",
+            "Content-Encoding": "identity",
         }
     )
 
 # --- Knowledge Base ---
 
+def _knowledge_summary() -> dict:
+    """Total entries, entries from the last 7 days and the newest created_at.
+
+    get_all_entries returns newest first, so one window serves both the recent
+    count and last_updated; it only widens while every entry in it is still
+    inside the cutoff, instead of pulling the whole knowledge base.
+    """
+    total = db.get_all_entries_count()
+    week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+    recent = 0
+    latest = None
+    limit = 100
+    while total > 0:
+        requested = min(limit, total)
+        entries = db.get_all_entries(limit=requested)
+        latest = entries[0].get('created_at') if entries else None
+        recent = sum(1 for e in entries if e.get('created_at', '') >= week_ago)
+        if recent < len(entries) or len(entries) < requested or requested >= total:
+            break
+        limit *= 4
+    return {"total": total, "recent": recent, "last_created_at": latest}
+
 @app.get("/knowledge/stats")
-async def get_knowledge_stats(username: str = Depends(verify_token)):
+@_on_db_thread
+def get_knowledge_stats(username: str = Depends(verify_token)):
     try:
-        from common.database import db
-        total_entries = db.get_all_entries_count()
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        all_entries = db.get_all_entries(limit=total_entries)
-        recent_entries = [e for e in all_entries if e.get('created_at', '') >= week_ago]
+        summary = _knowledge_summary()
         return {
-            "total_entries": total_entries,
-            "recent_entries": len(recent_entries),
-            "last_updated": all_entries[0].get('created_at') if all_entries else None
+            "total_entries": summary["total"],
+            "recent_entries": summary["recent"],
+            "last_updated": summary["last_created_at"]
         }
     except Exception as e:
         return {"total_entries": 0, "recent_entries": 0, "last_updated": None, "error": str(e)}
 
 @app.get("/knowledge/entries")
-async def get_knowledge_entries(
+@_on_db_thread
+def get_knowledge_entries(
     query: str = "",
     limit: int = 50,
     offset: int = 0,
@@ -340,7 +701,6 @@ async def get_knowledge_entries(
 ):
     """Browse or search knowledge base entries. Phase 1b fix: uses search_clean for queries."""
     try:
-        from common.database import db
         if query.strip():
             results = db.search_clean(query, limit=limit + offset)
         else:
@@ -351,7 +711,8 @@ async def get_knowledge_entries(
         return {"entries": [], "count": 0, "query": query, "error": str(e)}
 
 @app.get("/knowledge/search")
-async def advanced_search(
+@_on_db_thread
+def advanced_search(
     query: str = "",
     tags: Optional[str] = None,
     date_from: Optional[str] = None,
@@ -363,7 +724,6 @@ async def advanced_search(
 ):
     """Advanced search with filters."""
     try:
-        from common.database import db
         tag_list = [t.strip() for t in tags.split(",")] if tags else None
         results = db.search_with_filters(
             query=query or "",
@@ -385,14 +745,12 @@ class KnowledgeAddRequest(BaseModel):
     url: Optional[str] = None
 
 @app.post("/knowledge/add")
-async def add_knowledge_entry(
+@_on_db_thread
+def add_knowledge_entry(
     req: KnowledgeAddRequest,
     username: str = Depends(verify_token)
 ):
     """Add a knowledge entry directly from the web interface."""
-    from common.database import db
-    from common.contracts import KnowledgeEntry
-
     text = req.text.strip()
     if len(text) < 3:
         raise HTTPException(400, "Content too short to save")
@@ -401,8 +759,13 @@ async def add_knowledge_entry(
     if req.tags:
         tags = req.tags
     else:
-        from agents.archivist import _extract_tags
-        tags = _extract_tags(text)
+        # The archivist agent is optional here; save untagged rather than fail
+        try:
+            from agents.archivist import _extract_tags
+            tags = _extract_tags(text)
+        except Exception as e:
+            print(f"Tag extraction unavailable: {e}")
+            tags = []
 
     metadata = {}
     if req.url:
@@ -420,23 +783,199 @@ async def add_knowledge_entry(
     return {"message": "Saved", "id": entry.embedding_id, "tags": tags}
 
 @app.delete("/knowledge/{entry_id}")
-async def delete_knowledge_entry(
+@_on_db_thread
+def delete_knowledge_entry(
     entry_id: str,
     username: str = Depends(verify_token)
 ):
     """Delete a knowledge entry."""
-    from common.database import db
     try:
         db.delete_entry(entry_id)
         return {"message": "Deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- pm2 process cache ---
+# A background task refreshes `pm2 jlist` so request handlers never fork.
+
+PM2_REFRESH_SECONDS = 3
+_pm2_cache = {"processes": [], "error": None}
+
+def _format_pm2(raw) -> list:
+    """Flatten pm2 jlist output once per refresh, so readers never parse it.
+
+    Malformed payloads raise here, inside the refresher's guard, and surface
+    as the cached error instead of failing every reader.
+    """
+    processes = []
+    for p in raw:
+        env = p.get("pm2_env") or {}
+        monit = p.get("monit") or {}
+        processes.append({
+            "name": p.get("name", "?"),
+            "status": env.get("status", "unknown"),
+            "cpu": monit.get("cpu") or 0,
+            "memory_mb": round((monit.get("memory") or 0) / (1024 * 1024), 1),
+            "uptime": env.get("pm_uptime", 0),
+            "restarts": env.get("restart_time", 0),
+        })
+    return processes
+
+async def _refresh_pm2():
+    proc = await asyncio.create_subprocess_exec(
+        "pm2", "jlist", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode != 0:
+        _pm2_cache.update(processes=[], error="pm2 not available")
+        return
+    _pm2_cache.update(processes=_format_pm2(orjson.loads(stdout)), error=None)
+
+async def _pm2_refresher():
+    while True:
+        try:
+            await _refresh_pm2()
+        except Exception as e:
+            _pm2_cache.update(processes=[], error=str(e) or type(e).__name__)
+        await asyncio.sleep(PM2_REFRESH_SECONDS)
+
+# --- Knowledge graph cache ---
+
+KG_PATH = "/root/assistant-brain-os/data/knowledge_graph.pkl"
+_kg_cache = {"mtime": None, "kg": None}
+_kg_lock = threading.Lock()
+
+def _get_kg():
+    """Shared KnowledgeGraph, re-unpickled only when the pickle's mtime changes."""
+    try:
+        mtime = os.path.getmtime(KG_PATH)
+    except OSError:
+        mtime = None
+    with _kg_lock:
+        if _kg_cache["kg"] is None or _kg_cache["mtime"] != mtime:
+            _kg_cache["kg"] = KnowledgeGraph(KG_PATH)
+            _kg_cache["mtime"] = mtime
+        return _kg_cache["kg"]
+
+# --- Redis key scans ---
+
+SCAN_CACHE_TTL = 5  # seconds; dashboard and monitor polls arrive in bursts
+_scan_cache: dict = {}
+
+async def _scan_keys(pattern: str) -> list:
+    """Keys matching pattern via non-blocking SCAN, memoized briefly."""
+    cached = _scan_cache.get(pattern)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    keys = [key async for key in redis_client.scan_iter(match=pattern, count=500)]
+    _scan_cache[pattern] = (time.monotonic() + SCAN_CACHE_TTL, keys)
+    return keys
+
+async def _lrange_many(keys: list, end: int) -> list:
+    """LRANGE 0..end for every key in a single pipelined round-trip."""
+    pipe = redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.lrange(key, 0, end)
+    return await pipe.execute()
+
 # --- Dashboard Overview ---
+# Each block below is independent; dashboard_overview runs them concurrently
+# (blocking ones in worker threads) and merges whatever succeeds.
+
+def _overview_knowledge() -> dict:
+    summary = _knowledge_summary()
+    return {
+        "knowledge_total": summary["total"],
+        "knowledge_recent": summary["recent"],
+    }
+
+def _overview_tasks(username: str) -> dict:
+    user = _get_user(username)
+    now_iso = datetime.now().isoformat()
+    # Let the db filter and limit rather than pulling every pending task
+    return {
+        "pending_tasks": db.get_tasks(user["user_id"], status="pending", limit=10),
+        "overdue_tasks": db.get_tasks(user["user_id"], status="pending", due_before=now_iso, limit=5),
+    }
+
+def _overview_journal() -> dict:
+    data = {}
+    entries = db.get_journal_entries(limit=10)
+    data["journal_recent"] = entries[:3]
+    if entries:
+        data["journal_latest_mood"] = entries[0].get("metadata", {}).get("mood") if isinstance(entries[0].get("metadata"), dict) else None
+    # Streak: count consecutive days with journal entries
+    dates_with_entries = {e["created_at"][:10] for e in entries if e.get("created_at")}
+    # Bounded by the number of distinct dates, so no explicit day cap is needed
+    streak = 0
+    check_date = datetime.now().date()
+    while check_date.isoformat() in dates_with_entries:
+        streak += 1
+        check_date -= timedelta(days=1)
+    data["journal_streak"] = streak
+    return data
+
+def _overview_graph() -> dict:
+    kg = _get_kg()
+    stats = kg.get_stats()
+    return {
+        "graph_nodes": stats.get("total_nodes", 0),
+        "graph_edges": stats.get("total_edges", 0),
+        "graph_top_tags": list(stats.get("tags", {}).items())[:10],
+    }
+
+async def _overview_queue() -> dict:
+    return {"queue_length": await redis_client.llen(TASK_QUEUE)}
+
+def _overview_processes() -> dict:
+    return {
+        "processes": [
+            {
+                "name": p["name"],
+                "status": p["status"],
+                "cpu": p["cpu"],
+                "memory": p["memory_mb"],
+                "uptime": p["uptime"],
+                "restarts": p["restarts"],
+            }
+            for p in _pm2_cache["processes"]
+        ]
+    }
+
+async def _overview_activity() -> dict:
+    activities = []
+    conv_keys = (await _scan_keys("web_conversation:*") + await _scan_keys("conversation:*"))[:5]
+    for key, msgs in zip(conv_keys, await _lrange_many(conv_keys, 2)):
+        for msg_json in msgs:
+            try:
+                msg = orjson.loads(msg_json)
+                activities.append({
+                    "timestamp": msg.get("timestamp", ""),
+                    "source": "web" if "web" in key else "telegram",
+                    "content": msg.get("message", "")[:80]
+                })
+            except Exception:
+                pass
+    return {"recent_activity": heapq.nlargest(5, activities, key=lambda x: x.get("timestamp", ""))}
+
+# Dashboards poll every few seconds; serve a slightly stale payload per user
+# instead of redoing the whole fan-out on every poll.
+OVERVIEW_CACHE_TTL = 3  # seconds
+_overview_cache: dict = {}
 
 @app.get("/dashboard/overview")
 async def dashboard_overview(username: str = Depends(verify_token)):
     """Single aggregated call for the dashboard."""
+    now = time.monotonic()
+    cached = _overview_cache.get(username)
+    if cached and cached[0] > now:
+        return cached[1]
+
     data = {
         "knowledge_total": 0,
         "knowledge_recent": 0,
@@ -453,123 +992,38 @@ async def dashboard_overview(username: str = Depends(verify_token)):
         "recent_activity": [],
     }
 
-    # Knowledge stats
-    try:
-        from common.database import db
-        data["knowledge_total"] = db.get_all_entries_count()
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        all_entries = db.get_all_entries(limit=data["knowledge_total"])
-        data["knowledge_recent"] = len([e for e in all_entries if e.get('created_at', '') >= week_ago])
-    except Exception:
-        pass
-
-    # Tasks
-    try:
-        from common.database import db
-        user = _get_user(username)
-        pending = db.get_tasks(user["user_id"], status="pending")
-        data["pending_tasks"] = pending[:10]
-        now_iso = datetime.now().isoformat()
-        data["overdue_tasks"] = [t for t in pending if t.get("due_date") and t["due_date"] < now_iso][:5]
-    except Exception:
-        pass
-
-    # Journal
-    try:
-        from common.database import db
-        entries = db.get_journal_entries(limit=10)
-        data["journal_recent"] = entries[:3]
-        if entries:
-            data["journal_latest_mood"] = entries[0].get("metadata", {}).get("mood") if isinstance(entries[0].get("metadata"), dict) else None
-        # Streak: count consecutive days with journal entries
-        dates_with_entries = set()
-        for e in entries:
-            created = e.get("created_at", "")
-            if created:
-                dates_with_entries.add(created[:10])
-        streak = 0
-        check_date = datetime.now()
-        for _ in range(30):
-            if check_date.strftime("%Y-%m-%d") in dates_with_entries:
-                streak += 1
-                check_date -= timedelta(days=1)
-            else:
-                break
-        data["journal_streak"] = streak
-    except Exception:
-        pass
-
-    # Graph stats
-    try:
-        from common.knowledge_graph import KnowledgeGraph
-        kg = KnowledgeGraph("/root/assistant-brain-os/data/knowledge_graph.pkl")
-        stats = kg.get_stats()
-        data["graph_nodes"] = stats.get("total_nodes", 0)
-        data["graph_edges"] = stats.get("total_edges", 0)
-        data["graph_top_tags"] = list(stats.get("tags", {}).items())[:10]
-    except Exception:
-        pass
-
-    # Queue
-    try:
-        from common.config import TASK_QUEUE
-        data["queue_length"] = redis_client.llen(TASK_QUEUE)
-    except Exception:
-        pass
-
-    # PM2 processes
-    try:
-        result = subprocess.run(["pm2", "jlist"], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            processes = json.loads(result.stdout)
-            data["processes"] = [
-                {
-                    "name": p.get("name", "?"),
-                    "status": p.get("pm2_env", {}).get("status", "unknown"),
-                    "cpu": p.get("monit", {}).get("cpu", 0),
-                    "memory": round(p.get("monit", {}).get("memory", 0) / (1024 * 1024), 1),
-                    "uptime": p.get("pm2_env", {}).get("pm_uptime", 0),
-                    "restarts": p.get("pm2_env", {}).get("restart_time", 0),
-                }
-                for p in processes
-            ]
-    except Exception:
-        pass
-
-    # Recent activity from Redis conversations
-    try:
-        activities = []
-        conv_keys = redis_client.keys("web_conversation:*") + redis_client.keys("conversation:*")
-        for key in conv_keys[:5]:
-            msgs = redis_client.lrange(key, 0, 2)
-            for msg_json in msgs:
-                try:
-                    msg = json.loads(msg_json)
-                    activities.append({
-                        "timestamp": msg.get("timestamp", ""),
-                        "source": "web" if b"web" in key else "telegram",
-                        "content": msg.get("message", "")[:80]
-                    })
-                except Exception:
-                    pass
-        activities.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        data["recent_activity"] = activities[:5]
-    except Exception:
-        pass
-
+    results = await asyncio.gather(
+        _run_db(_overview_knowledge),
+        _run_db(_overview_tasks, username),
+        _run_db(_overview_journal),
+        asyncio.to_thread(_overview_graph),
+        _overview_queue(),
+        _overview_activity(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, dict):
+            data.update(result)
+    data.update(_overview_processes())
+
+    if len(_overview_cache) >= 64:
+        for name, (expires, _) in list(_overview_cache.items()):
+            if expires <= now:
+                del _overview_cache[name]
+    _overview_cache[username] = (time.monotonic() + OVERVIEW_CACHE_TTL, data)
     return data
 
 # --- Tasks CRUD ---
 
 @app.get("/tasks")
-async def get_tasks(
+@_on_db_thread
+def get_tasks(
     task_status: Optional[str] = None,
     due_before: Optional[str] = None,
     limit: int = 50,
     username: str = Depends(verify_token)
 ):
     try:
-        from common.database import db
         user = _get_user(username)
         tasks = db.get_tasks(user["user_id"], status=task_status, due_before=due_before, limit=limit)
         return {"tasks": tasks, "count": len(tasks)}
@@ -577,12 +1031,12 @@ async def get_tasks(
         return {"tasks": [], "count": 0, "error": str(e)}
 
 @app.post("/tasks")
-async def create_task(
+@_on_db_thread
+def create_task(
     task_req: TaskCreateRequest,
     username: str = Depends(verify_token)
 ):
     try:
-        from common.database import db
         user = _get_user(username)
         task_id = db.add_task(
             user_id=user["user_id"],
@@ -598,9 +1052,9 @@ async def create_task(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/tasks/{task_id}/complete")
-async def complete_task(task_id: str, username: str = Depends(verify_token)):
+@_on_db_thread
+def complete_task(task_id: str, username: str = Depends(verify_token)):
     try:
-        from common.database import db
         user = _get_user(username)
         ok = db.complete_task(task_id, user["user_id"])
         if not ok:
@@ -612,9 +1066,9 @@ async def complete_task(task_id: str, username: str = Depends(verify_token)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/tasks/{task_id}")
-async def delete_task(task_id: str, username: str = Depends(verify_token)):
+@_on_db_thread
+def delete_task(task_id: str, username: str = Depends(verify_token)):
     try:
-        from common.database import db
         user = _get_user(username)
         ok = db.delete_task(task_id, user["user_id"])
         if not ok:
@@ -628,14 +1082,14 @@ async def delete_task(task_id: str, username: str = Depends(verify_token)):
 # --- Journal ---
 
 @app.get("/journal")
-async def get_journal(
+@_on_db_thread
+def get_journal(
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     limit: int = 50,
     username: str = Depends(verify_token)
 ):
     try:
-        from common.database import db
         entries = db.get_journal_entries(date_from=date_from, date_to=date_to, limit=limit)
         return {"entries": entries, "count": len(entries)}
     except Exception as e:
@@ -644,51 +1098,50 @@ async def get_journal(
 # --- Knowledge Graph ---
 
 @app.get("/graph/stats")
-async def graph_stats(username: str = Depends(verify_token)):
+def graph_stats(username: str = Depends(verify_token)):
     try:
-        from common.knowledge_graph import KnowledgeGraph
-        kg = KnowledgeGraph("/root/assistant-brain-os/data/knowledge_graph.pkl")
+        kg = _get_kg()
         stats = kg.get_stats()
         return stats
     except Exception as e:
         return {"total_nodes": 0, "total_edges": 0, "error": str(e)}
 
 @app.get("/graph/data")
-async def graph_data(max_nodes: int = 200, username: str = Depends(verify_token)):
+def graph_data(max_nodes: int = 200, username: str = Depends(verify_token)):
     """Return nodes and edges for force-graph rendering."""
     try:
-        from common.knowledge_graph import KnowledgeGraph
-        kg = KnowledgeGraph("/root/assistant-brain-os/data/knowledge_graph.pkl")
+        kg = _get_kg()
 
-        nodes = []
-        for node_id, attrs in list(kg.graph.nodes(data=True))[:max_nodes]:
-            nodes.append({
+        nodes = [
+            {
                 "id": node_id,
                 "title": attrs.get("title", node_id),
                 "type": attrs.get("type", "note"),
                 "tags": attrs.get("tags", []),
-            })
+            }
+            for node_id, attrs in itertools.islice(kg.graph.nodes(data=True), max(max_nodes, 0))
+        ]
 
+        # The subgraph view only walks edges incident to the selected nodes
         node_ids = {n["id"] for n in nodes}
-        edges = []
-        for src, tgt, edge_attrs in kg.graph.edges(data=True):
-            if src in node_ids and tgt in node_ids:
-                edges.append({
-                    "source": src,
-                    "target": tgt,
-                    "relationship": edge_attrs.get("relationship", "related"),
-                })
+        edges = [
+            {
+                "source": src,
+                "target": tgt,
+                "relationship": edge_attrs.get("relationship", "related"),
+            }
+            for src, tgt, edge_attrs in kg.graph.subgraph(node_ids).edges(data=True)
+        ]
 
         return {"nodes": nodes, "edges": edges}
     except Exception as e:
         return {"nodes": [], "edges": [], "error": str(e)}
 
 @app.get("/graph/node/{node_id}")
-async def graph_node(node_id: str, username: str = Depends(verify_token)):
+def graph_node(node_id: str, username: str = Depends(verify_token)):
     """Get details for a single graph node."""
     try:
-        from common.knowledge_graph import KnowledgeGraph
-        kg = KnowledgeGraph("/root/assistant-brain-os/data/knowledge_graph.pkl")
+        kg = _get_kg()
         node = kg.get_node(node_id)
         if not node:
             raise HTTPException(status_code=404, detail="Node not found")
@@ -702,36 +1155,71 @@ async def graph_node(node_id: str, username: str = Depends(verify_token)):
 
 # --- Monitor ---
 
+REDIS_INFO_TTL = 2  # seconds
+_redis_info_cache = {"expires": 0.0, "info": {}}
+
+async def _redis_info() -> dict:
+    """Memory + server INFO sections only (not the full dump), cached briefly."""
+    if _redis_info_cache["expires"] > time.monotonic():
+        return _redis_info_cache["info"]
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.info("memory")
+    pipe.info("server")
+    memory, server = await pipe.execute()
+    _redis_info_cache.update(expires=time.monotonic() + REDIS_INFO_TTL, info={**server, **memory})
+    return _redis_info_cache["info"]
+
+# Topic histogram + content size: the full scan is redone when the
+# (count, newest entry) key moves, and at least every CONTENT_AGG_MAX_AGE
+# seconds, since editing or re-categorising an entry changes neither value.
+CONTENT_AGG_MAX_AGE = 60  # seconds
+_content_agg_cache = {"key": None, "expires": 0.0, "topics": {}, "size": 0}
+
+def _content_aggregates(total: int):
+    latest = db.get_all_entries(limit=1)
+    key = (total, latest[0].get('created_at') if latest else None)
+    if _content_agg_cache["key"] == key and _content_agg_cache["expires"] > time.monotonic():
+        return _content_agg_cache["topics"], _content_agg_cache["size"]
+    topics = {}
+    size = 0
+    for entry in db.get_all_entries(limit=total):
+        category = entry.get('category', 'uncategorized')
+        topics[category] = topics.get(category, 0) + 1
+        content = entry.get('content', '') or entry.get('summary', '')
+        size += len(content)
+    _content_agg_cache.update(
+        key=key, expires=time.monotonic() + CONTENT_AGG_MAX_AGE, topics=topics, size=size
+    )
+    return topics, size
+
+def _monitor_knowledge():
+    """SQLite/vector reads for /monitor/stats; run on DB_EXECUTOR."""
+    total_knowledge = 0
+    topics = {}
+    vector_count = 0
+    total_content_size = 0
+    try:
+        total_knowledge = db.get_all_entries_count()
+        topics, total_content_size = _content_aggregates(total_knowledge)
+        try:
+            vector_count = db.collection.count()
+        except Exception:
+            vector_count = total_knowledge
+    except Exception as e:
+        print(f"Knowledge stats error: {e}")
+    return total_knowledge, topics, vector_count, total_content_size
+
 @app.get("/monitor/stats")
 async def get_monitor_stats(username: str = Depends(verify_token)):
     try:
-        from common.config import TASK_QUEUE
-        queue_length = redis_client.llen(TASK_QUEUE)
-        conv_keys = redis_client.keys("web_conversation:*")
-        telegram_keys = redis_client.keys("conversation:*")
-        redis_info = redis_client.info()
+        queue_length = await redis_client.llen(TASK_QUEUE)
+        conv_keys = await _scan_keys("web_conversation:*")
+        telegram_keys = await _scan_keys("conversation:*")
+        redis_info = await _redis_info()
         redis_memory = redis_info.get('used_memory_human', 'N/A')
         redis_uptime = redis_info.get('uptime_in_seconds', 0)
 
-        total_knowledge = 0
-        topics = {}
-        vector_count = 0
-        total_content_size = 0
-        try:
-            from common.database import db
-            total_knowledge = db.get_all_entries_count()
-            all_entries = db.get_all_entries(limit=total_knowledge)
-            for entry in all_entries:
-                category = entry.get('category', 'uncategorized')
-                topics[category] = topics.get(category, 0) + 1
-                content = entry.get('content', '') or entry.get('summary', '')
-                total_content_size += len(content)
-            try:
-                vector_count = db.collection.count()
-            except Exception:
-                vector_count = total_knowledge
-        except Exception as e:
-            print(f"Knowledge stats error: {e}")
+        total_knowledge, topics, vector_count, total_content_size = await _run_db(_monitor_knowledge)
 
         if total_content_size > 1024 * 1024:
             content_size_str = f"{total_content_size / (1024 * 1024):.2f} MB"
@@ -759,34 +1247,36 @@ async def get_monitor_stats(username: str = Depends(verify_token)):
 async def get_recent_activity(limit: int = 50, username: str = Depends(verify_token)):
     try:
         activities = []
-        conv_keys = redis_client.keys("web_conversation:*") + redis_client.keys("conversation:*")
-        for key in conv_keys[:10]:
-            messages = redis_client.lrange(key, 0, 5)
+        now = datetime.now().isoformat()
+        conv_keys = (await _scan_keys("web_conversation:*") + await _scan_keys("conversation:*"))[:10]
+        for key, messages in zip(conv_keys, await _lrange_many(conv_keys, 5)):
             for msg_json in messages:
                 try:
-                    msg = json.loads(msg_json)
+                    msg = orjson.loads(msg_json)
                     activities.append({
-                        "timestamp": msg.get("timestamp", datetime.now().isoformat()),
+                        "timestamp": msg.get("timestamp", now),
                         "type": "message",
-                        "source": "web" if "web" in key.decode() else "telegram",
+                        "source": "web" if "web" in key else "telegram",
                         "content": msg.get("message", "")[:100]
                     })
                 except Exception:
                     pass
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        return {"activities": activities[:limit], "count": len(activities)}
+        recent = heapq.nlargest(limit, activities, key=lambda x: x["timestamp"])
+        return {"activities": recent, "count": len(activities)}
     except Exception as e:
         return {"activities": [], "count": 0, "error": str(e)}
 
 @app.get("/monitor/queue")
 async def get_queue_status(username: str = Depends(verify_token)):
     try:
-        from common.config import TASK_QUEUE
-        queue_items = redis_client.lrange(TASK_QUEUE, 0, 20)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.llen(TASK_QUEUE)
+        pipe.lrange(TASK_QUEUE, 0, 20)
+        queue_length, queue_items = await pipe.execute()
         jobs = []
         for item in queue_items:
             try:
-                job_data = json.loads(item)
+                job_data = orjson.loads(item)
                 jobs.append({
                     "agent": job_data.get("current_agent", "unknown"),
                     "source": job_data.get("payload", {}).get("source", "unknown"),
@@ -794,50 +1284,39 @@ async def get_queue_status(username: str = Depends(verify_token)):
                 })
             except Exception:
                 pass
-        return {"queue_length": len(queue_items), "jobs": jobs}
+        return {"queue_length": queue_length, "jobs": jobs}
     except Exception as e:
         return {"queue_length": 0, "jobs": [], "error": str(e)}
 
 @app.get("/monitor/processes")
 async def get_processes(username: str = Depends(verify_token)):
     """Get pm2 process status."""
-    try:
-        result = subprocess.run(["pm2", "jlist"], capture_output=True, text=True, timeout=5)
-        if result.returncode != 0:
-            return {"processes": [], "error": "pm2 not available"}
-        processes = json.loads(result.stdout)
-        return {
-            "processes": [
-                {
-                    "name": p.get("name", "?"),
-                    "status": p.get("pm2_env", {}).get("status", "unknown"),
-                    "cpu": p.get("monit", {}).get("cpu", 0),
-                    "memory_mb": round(p.get("monit", {}).get("memory", 0) / (1024 * 1024), 1),
-                    "uptime": p.get("pm2_env", {}).get("pm_uptime", 0),
-                    "restarts": p.get("pm2_env", {}).get("restart_time", 0),
-                }
-                for p in processes
-            ]
-        }
-    except Exception as e:
-        return {"processes": [], "error": str(e)}
+    if _pm2_cache["error"]:
+        return {"processes": [], "error": _pm2_cache["error"]}
+    return {"processes": _pm2_cache["processes"]}
+
+ERRORS_DIR = "/tmp/rescue_issues"
+
+def _read_json_file(path: str):
+    with open(path, "rb") as fh:
+        return orjson.loads(fh.read())
 
 @app.get("/monitor/errors")
 async def get_errors(limit: int = 20, username: str = Depends(verify_token)):
     """Read recent error reports from rescue issues."""
     try:
-        error_files = sorted(
-            globmod.glob("/tmp/rescue_issues/*.json"),
-            key=os.path.getmtime,
-            reverse=True
-        )[:limit]
-        errors = []
-        for f in error_files:
-            try:
-                with open(f) as fh:
-                    errors.append(json.load(fh))
-            except Exception:
-                pass
+        try:
+            # scandir hands back the stat with each entry: one syscall per file
+            with os.scandir(ERRORS_DIR) as it:
+                entries = [(e.stat().st_mtime, e.path) for e in it if e.name.endswith(".json")]
+        except FileNotFoundError:
+            entries = []
+        entries.sort(reverse=True)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_read_json_file, path) for _, path in entries[:limit]),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if not isinstance(r, BaseException)]
         return {"errors": errors, "count": len(errors)}
     except Exception as e:
         return {"errors": [], "count": 0, "error": str(e)}
@@ -851,43 +1330,70 @@ SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settin
 def _load_settings() -> dict:
     if os.path.exists(SETTINGS_FILE):
         try:
-            with open(SETTINGS_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(SETTINGS_FILE, "rb") as f:
+                return orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError):
             pass
     return {}
 
 def _save_settings(settings: dict):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=2)
+    _write_atomic(SETTINGS_FILE, orjson.dumps(settings, option=orjson.OPT_INDENT_2))
+
+# Loaded once, like USERS_DB; this dict is authoritative and the file is only
+# written back (off the event loop) when a setting changes.
+SETTINGS = _load_settings()
+
+ENV_OVERRIDES_FILE = "/root/assistant-brain-os/.env.overrides"
+
+def _update_env_overrides(updates: dict):
+    """Merge updates into .env.overrides: one read, one atomic write."""
+    overrides = {}
+    try:
+        with open(ENV_OVERRIDES_FILE) as f:
+            data = f.read()
+        overrides = dict(
+            line.split('=', 1) for line in map(str.strip, data.splitlines())
+            if '=' in line and not line.startswith('#')
+        )
+    except (OSError, UnicodeDecodeError):
+        pass
+    overrides.update(updates)
+    payload = "".join(f"{k}={v}\n" for k, v in overrides.items())
+    _write_atomic(ENV_OVERRIDES_FILE, payload.encode())
 
 class LLMSettingsRequest(BaseModel):
     provider: str  # "openai", "deepseek", "openrouter"
     api_key: Optional[str] = None
     model: Optional[str] = None
 
+# Provider keys come from the process environment, which doesn't change after
+# startup (POST /settings/llm writes .env.overrides for the worker, not us).
+_ENV_FLAGS = {
+    "has_openai_key": bool(os.getenv("OPENAI_API_KEY")),
+    "has_deepseek_key": bool(os.getenv("DEEPSEEK_API_KEY")),
+    "has_openrouter_key": bool(os.getenv("OPENROUTER_API_KEY")),
+}
+_ENV_OPENROUTER_KEY = os.getenv("OPENROUTER_API_KEY", "")
+
+def _mask_key(key):
+    """Mask API keys for display."""
+    if not key:
+        return ""
+    if len(key) <= 8:
+        return "***"
+    return key[:4] + "..." + key[-4:]
+
 @app.get("/settings/llm")
 async def get_llm_settings(username: str = Depends(verify_token)):
     """Get current LLM provider settings."""
-    from common.config import LLM_PROVIDER, MODEL_NAME
-    settings = _load_settings()
-    user_settings = settings.get(username, {}).get("llm", {})
-
-    # Mask API keys for display
-    def mask_key(key):
-        if not key:
-            return ""
-        if len(key) <= 8:
-            return "***"
-        return key[:4] + "..." + key[-4:]
-
+    user_settings = SETTINGS.get(username, {}).get("llm", {})
     return {
         "provider": user_settings.get("provider", LLM_PROVIDER),
         "model": user_settings.get("model", MODEL_NAME),
-        "has_openai_key": bool(os.getenv("OPENAI_API_KEY")),
-        "has_deepseek_key": bool(os.getenv("DEEPSEEK_API_KEY")),
-        "has_openrouter_key": bool(os.getenv("OPENROUTER_API_KEY") or user_settings.get("openrouter_key")),
-        "openrouter_key_masked": mask_key(user_settings.get("openrouter_key", os.getenv("OPENROUTER_API_KEY", ""))),
+        "has_openai_key": _ENV_FLAGS["has_openai_key"],
+        "has_deepseek_key": _ENV_FLAGS["has_deepseek_key"],
+        "has_openrouter_key": _ENV_FLAGS["has_openrouter_key"] or bool(user_settings.get("openrouter_key")),
+        "openrouter_key_masked": _mask_key(user_settings.get("openrouter_key", _ENV_OPENROUTER_KEY)),
     }
 
 @app.post("/settings/llm")
@@ -896,45 +1402,26 @@ async def update_llm_settings(
     username: str = Depends(verify_token)
 ):
     """Update LLM provider settings. Writes to .env.overrides for worker pickup."""
-    settings = _load_settings()
-    if username not in settings:
-        settings[username] = {}
-
-    settings[username]["llm"] = {
+    llm_settings = {
         "provider": req.provider,
         "model": req.model,
     }
 
     # Store OpenRouter key per-user if provided
     if req.api_key and req.provider == "openrouter":
-        settings[username]["llm"]["openrouter_key"] = req.api_key
+        llm_settings["openrouter_key"] = req.api_key
 
-    _save_settings(settings)
+    SETTINGS.setdefault(username, {})["llm"] = llm_settings
+    await asyncio.to_thread(_save_settings, SETTINGS)
 
     # Write overrides to .env.overrides for worker to pick up
-    overrides_path = "/root/assistant-brain-os/.env.overrides"
-    overrides = {}
-    if os.path.exists(overrides_path):
-        try:
-            with open(overrides_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if '=' in line and not line.startswith('#'):
-                        k, v = line.split('=', 1)
-                        overrides[k] = v
-        except Exception:
-            pass
-
-    overrides["LLM_PROVIDER"] = req.provider
+    updates = {"LLM_PROVIDER": req.provider}
     if req.model:
         if req.provider == "openrouter":
-            overrides["OPENROUTER_MODEL"] = req.model
+            updates["OPENROUTER_MODEL"] = req.model
     if req.api_key and req.provider == "openrouter":
-        overrides["OPENROUTER_API_KEY"] = req.api_key
-
-    with open(overrides_path, "w") as f:
-        for k, v in overrides.items():
-            f.write(f"{k}={v}\n")
+        updates["OPENROUTER_API_KEY"] = req.api_key
+    await asyncio.to_thread(_update_env_overrides, updates)
 
     return {"message": "Settings saved", "provider": req.provider, "model": req.model}
 
@@ -946,4 +1433,4 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
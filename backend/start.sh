@@ -1,4 +1,9 @@
 #!/bin/bash
 cd /root/brain-web-interface/backend
 source venv/bin/activate
-exec uvicorn main:app --host 0.0.0.0 --port 8000
+# uvloop/httptools ship with uvicorn[standard]. In-memory state (users, token
+# cache, login throttle) is per process, so keep WEB_CONCURRENCY at 1 unless
+# that state moves out of process.
+exec uvicorn main:app --host 0.0.0.0 --port 8000 \
+    --loop uvloop --http httptools \
+    --workers "${WEB_CONCURRENCY:-1}"
@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def setup_function():
+    main._failed_logins.clear()
+    main._failed_unknown_logins.clear()
+
+
+def test_failed_login_map_is_capped():
+    for i in range(main.LOGIN_THROTTLE_SIZE + 500):
+        main._record_login_failure(f"spray-{i}", known=False)
+    assert len(main._failed_unknown_logins) == main.LOGIN_THROTTLE_SIZE
+    # Oldest windows are the ones dropped
+    assert "spray-0" not in main._failed_unknown_logins
+    assert f"spray-{main.LOGIN_THROTTLE_SIZE + 499}" in main._failed_unknown_logins
+
+
+def test_expired_windows_are_pruned_before_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    for i in range(main.LOGIN_THROTTLE_SIZE):
+        main._record_login_failure(f"old-{i}", known=False)
+    now[0] += main.LOGIN_LOCKOUT_SECONDS + 1
+    main._record_login_failure("fresh", known=False)
+    assert list(main._failed_unknown_logins) == ["fresh"]
+
+
+def test_repeat_failures_still_lock_out():
+    for _ in range(main.LOGIN_MAX_FAILURES):
+        main._record_login_failure("admin")
+    assert main._login_locked("admin")
+
+
+def test_unknown_username_spray_does_not_unlock_real_user():
+    client = TestClient(main.app)
+    for _ in range(main.LOGIN_MAX_FAILURES):
+        client.post("/auth/login", json={"username": "admin", "password": "wrong"})
+    assert client.post("/auth/login", json={"username": "admin", "password": "wrong"}).status_code == 429
+
+    for i in range(main.LOGIN_THROTTLE_SIZE + 1):
+        client.post("/auth/login", json={"username": f"junk{i}", "password": "x"})
+
+    assert main._login_locked("admin")
+    assert client.post("/auth/login", json={"username": "admin", "password": "wrong"}).status_code == 429
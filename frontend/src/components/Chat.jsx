@@ -99,7 +99,10 @@ function Chat({ token, username }) {
   const [selectedAgent, setSelectedAgent] = useState('auto')
   const messagesEndRef = useRef(null)
   const eventSourceRef = useRef(null)
-  const pollingInterval = useRef(null)
+  const pollingActive = useRef(false)
+  const pollAbortRef = useRef(null)
+  const pollGeneration = useRef(0)
+  const sseRetryRef = useRef({ timer: null, delay: 2000 })
   const textareaRef = useRef(null)
 
   useEffect(() => { loadHistory() }, [])
@@ -108,14 +111,16 @@ function Chat({ token, username }) {
   useEffect(() => {
     connectSSE()
     return () => {
+      clearTimeout(sseRetryRef.current.timer)
       if (eventSourceRef.current) eventSourceRef.current.close()
-      if (pollingInterval.current) clearInterval(pollingInterval.current)
+      pollingActive.current = false
+      // Drop the in-flight long-poll so the server stops waiting on our behalf
+      if (pollAbortRef.current) pollAbortRef.current.abort()
     }
   }, [])
 
   const connectSSE = useCallback(() => {
     if (eventSourceRef.current) eventSourceRef.current.close()
-    if (pollingInterval.current) clearInterval(pollingInterval.current)
 
     try {
       const sseToken = localStorage.getItem('token')
@@ -137,20 +142,40 @@ function Chat({ token, username }) {
         }
       }
 
+      es.onopen = () => {
+        // Stream is (back) up: stop the long-poll fallback and reset backoff
+        sseRetryRef.current.delay = 2000
+        stopPolling()
+      }
+
       es.onerror = () => {
         es.close()
         eventSourceRef.current = null
-        // Fall back to polling
+        // Long-poll meanwhile, and retry the stream with backoff
         startPolling()
+        scheduleSSERetry()
       }
     } catch {
       startPolling()
     }
   }, [])
 
+  const scheduleSSERetry = () => {
+    const retry = sseRetryRef.current
+    clearTimeout(retry.timer)
+    retry.timer = setTimeout(() => connectSSE(), retry.delay)
+    retry.delay = Math.min(retry.delay * 2, 60000)
+  }
+
+  const stopPolling = () => {
+    pollingActive.current = false
+    if (pollAbortRef.current) pollAbortRef.current.abort()
+  }
+
   const startPolling = () => {
-    if (pollingInterval.current) return
-    pollingInterval.current = setInterval(checkForResponses, 2000)
+    if (pollingActive.current) return
+    pollingActive.current = true
+    waitForResponses(++pollGeneration.current)
   }
 
   useEffect(() => {
@@ -175,22 +200,30 @@ function Chat({ token, username }) {
     }
   }
 
-  const checkForResponses = async () => {
-    try {
-      const response = await api.get('/messages/pending')
-      if (response.data.responses && response.data.responses.length > 0) {
-        setIsTyping(false)
-        response.data.responses.forEach(res => {
-          setMessages(prev => [...prev, {
-            message: res.message,
-            sender: 'bot',
-            timestamp: res.timestamp,
-            agent: res.agent
-          }])
-        })
+  // Long-poll: the server holds each request until a response arrives or times out
+  // (a loop started before the last stop/start cycle exits on its next check)
+  const waitForResponses = async (generation) => {
+    while (pollingActive.current && pollGeneration.current === generation) {
+      const controller = new AbortController()
+      pollAbortRef.current = controller
+      try {
+        const response = await api.get('/messages/pending/wait', { signal: controller.signal })
+        if (response.data.responses && response.data.responses.length > 0) {
+          setIsTyping(false)
+          response.data.responses.forEach(res => {
+            setMessages(prev => [...prev, {
+              message: res.message,
+              sender: 'bot',
+              timestamp: res.timestamp,
+              agent: res.agent
+            }])
+          })
+        }
+      } catch (err) {
+        if (controller.signal.aborted) break
+        console.error('Failed to check responses:', err)
+        await new Promise(resolve => setTimeout(resolve, 2000))
       }
-    } catch (err) {
-      console.error('Failed to check responses:', err)
     }
   }
 